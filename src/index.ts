@@ -9,25 +9,38 @@ import {
 } from '@modelcontextprotocol/sdk/types.js';
 import { z } from 'zod';
 import * as path from 'path';
-import * as fs from 'fs';
-import { execFile } from 'child_process';
-import { promisify } from 'util';
-import { randomUUID } from 'crypto';
 import { fileURLToPath } from 'url';
 import { dirname } from 'path';
-import { CommandService, CommandSecurityLevel } from './services/command-service.js';
-import { getLogger, Logger } from './utils/logger.js';
+import { CommandService, CommandSecurityLevel, getBaseCommand } from './services/command-service.js';
+import { getLogger } from './utils/logger.js';
+import { detectPlatform, getShellSuggestions, getCommonShellLocations } from './utils/platform-utils.js';
 
 // In ESM, __dirname is not available directly, so we create it
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = dirname(__filename);
 
-const execFileAsync = promisify(execFile);
 // Initialize the logger
 // Use __dirname to get the directory of the current file
 const LOG_FILE = path.join(__dirname, '../logs/super-shell-mcp.log');
 console.error(`Log file path: ${LOG_FILE}`);
-const logger = getLogger(LOG_FILE, true);
+const logger = getLogger(
+  LOG_FILE,
+  true,
+  /^(1|true|yes|on)$/i.test(process.env.SUPER_SHELL_MCP_DEBUG ?? ''),
+  true
+);
+
+// Tool responses are parsed by MCP clients, so only pretty-print them on request
+const JSON_INDENT = /^(1|true|yes|on)$/i.test(process.env.SUPER_SHELL_PRETTY ?? '') ? 2 : 0;
+
+/**
+ * Security levels accepted by the whitelist tools
+ */
+const SECURITY_LEVELS = {
+  safe: CommandSecurityLevel.SAFE,
+  requires_approval: CommandSecurityLevel.REQUIRES_APPROVAL,
+  forbidden: CommandSecurityLevel.FORBIDDEN,
+} as const;
 
 /**
  * SuperShellMcpServer - MCP server for executing shell commands across multiple platforms
@@ -46,7 +59,6 @@ interface SuperShellMcpServerOptions {
 class SuperShellMcpServer {
   private server: Server;
   private commandService: CommandService;
-  private pendingApprovals: Map<string, { command: string; args: string[] }>;
 
   constructor(options?: SuperShellMcpServerOptions) {
     // Initialize the command service with auto-detected or specified shell
@@ -55,7 +67,6 @@ class SuperShellMcpServer {
       useShell: options?.commandExecution?.useShell,
       defaultTimeout: options?.commandExecution?.defaultTimeout,
     });
-    this.pendingApprovals = new Map();
 
     // Initialize the MCP server
     this.server = new Server(
@@ -79,7 +90,6 @@ class SuperShellMcpServer {
     // Error handling
     this.server.onerror = (error) => {
       logger.error(`[MCP Error] ${error}`);
-      console.error('[MCP Error]', error);
     };
     
     process.on('SIGINT', async () => {
@@ -97,35 +107,23 @@ class SuperShellMcpServer {
   private setupCommandServiceEvents(): void {
     this.commandService.on('command:pending', (pendingCommand) => {
       logger.info(`[Pending Command] ID: ${pendingCommand.id}, Command: ${pendingCommand.command} ${pendingCommand.args.join(' ')}`);
-      console.error(`[Pending Command] ID: ${pendingCommand.id}, Command: ${pendingCommand.command} ${pendingCommand.args.join(' ')}`);
-      this.pendingApprovals.set(pendingCommand.id, {
-        command: pendingCommand.command,
-        args: pendingCommand.args,
-      });
     });
 
     this.commandService.on('command:approved', (data) => {
       logger.info(`[Approved Command] ID: ${data.commandId}`);
-      console.error(`[Approved Command] ID: ${data.commandId}`);
-      this.pendingApprovals.delete(data.commandId);
     });
 
     this.commandService.on('command:denied', (data) => {
       logger.info(`[Denied Command] ID: ${data.commandId}, Reason: ${data.reason}`);
-      console.error(`[Denied Command] ID: ${data.commandId}, Reason: ${data.reason}`);
-      this.pendingApprovals.delete(data.commandId);
     });
 
     this.commandService.on('command:failed', (data) => {
       logger.error(`[Failed Command] ID: ${data.commandId}, Error: ${data.error.message}`);
-      console.error(`[Failed Command] ID: ${data.commandId}, Error: ${data.error.message}`);
-      this.pendingApprovals.delete(data.commandId);
     });
     
     // Handle approval timeout events
     this.commandService.on('command:approval_timeout', (data) => {
       logger.error(`[Approval Timeout] ID: ${data.commandId}, Message: ${data.message}`);
-      console.error(`[Approval Timeout] ID: ${data.commandId}, Message: ${data.message}`);
       // Log the timeout but keep the command in the pending queue
       // The AI assistant will need to use get_pending_commands and approve_command to proceed
     });
@@ -339,29 +337,32 @@ class SuperShellMcpServer {
     });
 
     // Log the start of command execution
-    logger.debug(`handleExecuteCommand called with args: ${JSON.stringify(args)}`);
+    if (logger.isDebugEnabled()) {
+      logger.debug(`handleExecuteCommand called with args: ${JSON.stringify(args)}`);
+    }
 
     const { command, args: commandArgs = [] } = schema.parse(args);
 
     // Extract the base command (without path)
-    const baseCommand = path.basename(command);
-    
-    logger.debug(`[Executing Command] Command: ${command} ${commandArgs.join(' ')}`);
-    logger.debug(`Base command: ${baseCommand}`);
+    const baseCommand = getBaseCommand(command);
     
     // Check if the command requires approval before attempting execution
-    const whitelist = this.commandService.getWhitelist();
-    logger.debug(`Whitelist entries: ${whitelist.length}`);
-    
-    const whitelistEntry = whitelist.find(entry => entry.command === baseCommand);
-    logger.debug(`Whitelist entry found: ${whitelistEntry ? 'yes' : 'no'}`);
-    
-    if (whitelistEntry) {
-      logger.debug(`Security level: ${whitelistEntry.securityLevel}`);
+    const whitelistEntry = this.commandService.getWhitelistEntry(baseCommand);
+
+    if (logger.isDebugEnabled()) {
+      logger.debug(`[Executing Command] Command: ${command} ${commandArgs.join(' ')}`);
+      logger.debug(`Base command: ${baseCommand}`);
+      logger.debug(`Whitelist entry found: ${whitelistEntry ? 'yes' : 'no'}`);
+
+      if (whitelistEntry) {
+        logger.debug(`Security level: ${whitelistEntry.securityLevel}`);
+      }
     }
     
     if (whitelistEntry && whitelistEntry.securityLevel === CommandSecurityLevel.REQUIRES_APPROVAL) {
-      logger.debug(`[Command Requires Approval] Command: ${command} ${commandArgs.join(' ')}`);
+      if (logger.isDebugEnabled()) {
+        logger.debug(`[Command Requires Approval] Command: ${command} ${commandArgs.join(' ')}`);
+      }
       
       // Use the non-blocking method to queue the command for approval
       const commandId = this.commandService.queueCommandForApprovalNonBlocking(command, commandArgs);
@@ -402,7 +403,7 @@ class SuperShellMcpServer {
         ? error.message
         : 'Unknown error occurred';
       
-      console.error(`[Command Execution Failed] Error: ${errorMessage}`);
+      logger.error(`[Command Execution Failed] Error: ${errorMessage}`);
       
       return {
         content: [
@@ -420,13 +421,11 @@ class SuperShellMcpServer {
    * Handle get_whitelist tool
    */
   private async handleGetWhitelist() {
-    const whitelist = this.commandService.getWhitelist();
-    
     return {
       content: [
         {
           type: 'text',
-          text: JSON.stringify(whitelist, null, 2),
+          text: this.commandService.getWhitelistJson(JSON_INDENT),
         },
       ],
     };
@@ -445,11 +444,7 @@ class SuperShellMcpServer {
     const { command, securityLevel, description } = schema.parse(args);
 
     // Map string security level to enum
-    const securityLevelEnum = securityLevel === 'safe'
-      ? CommandSecurityLevel.SAFE
-      : securityLevel === 'requires_approval'
-        ? CommandSecurityLevel.REQUIRES_APPROVAL
-        : CommandSecurityLevel.FORBIDDEN;
+    const securityLevelEnum = SECURITY_LEVELS[securityLevel];
 
     this.commandService.addToWhitelist({
       command,
@@ -479,11 +474,7 @@ class SuperShellMcpServer {
     const { command, securityLevel } = schema.parse(args);
 
     // Map string security level to enum
-    const securityLevelEnum = securityLevel === 'safe'
-      ? CommandSecurityLevel.SAFE
-      : securityLevel === 'requires_approval'
-        ? CommandSecurityLevel.REQUIRES_APPROVAL
-        : CommandSecurityLevel.FORBIDDEN;
+    const securityLevelEnum = SECURITY_LEVELS[securityLevel];
 
     this.commandService.updateSecurityLevel(command, securityLevelEnum);
 
@@ -523,8 +514,6 @@ class SuperShellMcpServer {
    * Handle get_platform_info tool
    */
   private async handleGetPlatformInfo() {
-    const { detectPlatform, getShellSuggestions, getCommonShellLocations } = await import('./utils/platform-utils.js');
-    
     const platform = detectPlatform();
     const currentShell = this.commandService.getShell();
     const shellExecutionEnabled = this.commandService.isShellEnabled();
@@ -544,7 +533,7 @@ class SuperShellMcpServer {
             helpMessage: shellExecutionEnabled
               ? `Super Shell MCP is running on ${platform} using ${currentShell} with shell parsing enabled.`
               : `Super Shell MCP is running on ${platform} executing commands without shell parsing.`,
-          }, null, 2),
+          }, null, JSON_INDENT),
         },
       ],
     };
@@ -566,7 +555,7 @@ class SuperShellMcpServer {
             args: cmd.args,
             requestedAt: cmd.requestedAt,
             requestedBy: cmd.requestedBy,
-          })), null, 2),
+          })), null, JSON_INDENT),
         },
       ],
     };
@@ -580,30 +569,28 @@ class SuperShellMcpServer {
       commandId: z.string(),
     });
 
-    logger.debug(`handleApproveCommand called with args: ${JSON.stringify(args)}`);
+    if (logger.isDebugEnabled()) {
+      logger.debug(`handleApproveCommand called with args: ${JSON.stringify(args)}`);
+    }
 
     const { commandId } = schema.parse(args);
 
-    // Log the approval attempt
-    logger.debug(`[Approval Attempt] ID: ${commandId}`);
-
-    // Check if the command exists in our local pending approvals map
-    const localPending = this.pendingApprovals.has(commandId);
-    logger.debug(`Command found in local pendingApprovals: ${localPending ? 'yes' : 'no'}`);
-
-    // Check if the command exists in the CommandService's pending queue
-    const pendingCommands = this.commandService.getPendingCommands();
-    logger.debug(`CommandService pending commands: ${pendingCommands.length}`);
-    const pendingCommand = pendingCommands.find(cmd => cmd.id === commandId);
-    logger.debug(`Command found in CommandService pending queue: ${pendingCommand ? 'yes' : 'no'}`);
-    
-    if (pendingCommand) {
-      logger.debug(`Pending command details: ${JSON.stringify({
-        id: pendingCommand.id,
-        command: pendingCommand.command,
-        args: pendingCommand.args,
-        requestedAt: pendingCommand.requestedAt
-      })}`);
+    if (logger.isDebugEnabled()) {
+      // Log the approval attempt
+      logger.debug(`[Approval Attempt] ID: ${commandId}`);
+
+      // Check if the command exists in the CommandService's pending queue
+      const pendingCommand = this.commandService.getPendingCommand(commandId);
+      logger.debug(`Command found in CommandService pending queue: ${pendingCommand ? 'yes' : 'no'}`);
+
+      if (pendingCommand) {
+        logger.debug(`Pending command details: ${JSON.stringify({
+          id: pendingCommand.id,
+          command: pendingCommand.command,
+          args: pendingCommand.args,
+          requestedAt: pendingCommand.requestedAt
+        })}`);
+      }
     }
 
     try {
@@ -611,8 +598,10 @@ class SuperShellMcpServer {
       // Use the CommandService's approveCommand method directly
       const result = await this.commandService.approveCommand(commandId);
       
-      logger.debug(`[Command Approved] ID: ${commandId}, Output length: ${result.stdout.length}`);
-      logger.debug(`Command output: ${result.stdout.substring(0, 100)}${result.stdout.length > 100 ? '...' : ''}`);
+      if (logger.isDebugEnabled()) {
+        logger.debug(`[Command Approved] ID: ${commandId}, Output length: ${result.stdout.length}`);
+        logger.debug(`Command output: ${result.stdout.substring(0, 100)}${result.stdout.length > 100 ? '...' : ''}`);
+      }
       
       return {
         content: [
@@ -653,7 +642,9 @@ class SuperShellMcpServer {
       reason: z.string().optional(),
     });
 
-    logger.debug(`handleDenyCommand called with args: ${JSON.stringify(args)}`);
+    if (logger.isDebugEnabled()) {
+      logger.debug(`handleDenyCommand called with args: ${JSON.stringify(args)}`);
+    }
 
     const { commandId, reason } = schema.parse(args);
 
@@ -697,8 +688,6 @@ class SuperShellMcpServer {
     const transport = new StdioServerTransport();
     await this.server.connect(transport);
     logger.info('Super Shell MCP server running on stdio');
-    console.error('Super Shell MCP server running on stdio');
-    console.error(`Log file: ${LOG_FILE}`);
     logger.info(`Log file: ${LOG_FILE}`);
   }
 }
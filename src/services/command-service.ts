@@ -1,38 +1,23 @@
 import { execFile } from 'child_process';
-import { promisify } from 'util';
 import { randomUUID } from 'crypto';
 import { EventEmitter } from 'events';
 import * as path from 'path';
+import { performance } from 'perf_hooks';
 import { getDefaultShell } from '../utils/platform-utils.js';
 import { getPlatformSpecificCommands } from '../utils/command-whitelist-utils.js';
+import { CommandSecurityLevel, CommandWhitelistEntry } from './command-types.js';
 
-const execFileAsync = promisify(execFile);
+export { CommandSecurityLevel } from './command-types.js';
+export type { CommandWhitelistEntry } from './command-types.js';
 
-/**
- * Command security level classification
- */
-export enum CommandSecurityLevel {
-  /** Safe commands that can be executed without approval */
-  SAFE = 'safe',
-  /** Commands that require approval before execution */
-  REQUIRES_APPROVAL = 'requires_approval',
-  /** Commands that are explicitly forbidden */
-  FORBIDDEN = 'forbidden'
-}
+/** How long a timed out command gets to exit after SIGTERM before it is killed */
+const KILL_GRACE_PERIOD_MS = 1000;
 
-/**
- * Command whitelist entry
- */
-export interface CommandWhitelistEntry {
-  /** The command path or name */
-  command: string;
-  /** Security level of the command */
-  securityLevel: CommandSecurityLevel;
-  /** Allowed arguments (string for exact match, RegExp for pattern match) */
-  allowedArgs?: Array<string | RegExp>;
-  /** Description of the command for documentation */
-  description?: string;
-}
+/** How long a command may stay pending before an approval timeout warning is emitted */
+const APPROVAL_TIMEOUT_MS = 5000;
+
+/** How often pending commands are checked for approval timeouts */
+const APPROVAL_TIMEOUT_CHECK_INTERVAL_MS = 1000;
 
 /**
  * Pending command awaiting approval
@@ -76,6 +61,22 @@ export interface CommandServiceOptions {
   defaultTimeout?: number;
 }
 
+/**
+ * Extract the base command (without path) used for whitelist lookups
+ * @param command The command as provided by the caller
+ * @returns The command name without any leading path
+ */
+export function getBaseCommand(command: string): string {
+  let separator = command.lastIndexOf('/');
+
+  // Backslash only separates path segments on Windows
+  if (path.sep === '\\') {
+    separator = Math.max(separator, command.lastIndexOf('\\'));
+  }
+
+  return command.slice(separator + 1);
+}
+
 /**
  * Service for securely executing shell commands
  */
@@ -84,10 +85,20 @@ export class CommandService extends EventEmitter {
   private shell: string;
   /** Whether shell parsing is enabled */
   private useShell: boolean;
+  /** Shell option passed to execFile, or false when shell parsing is disabled */
+  private shellOption: string | false;
   /** Command whitelist */
   private whitelist: Map<string, CommandWhitelistEntry>;
+  /** Serialized whitelist, rebuilt after the whitelist changes */
+  private whitelistJson: { indent: number; json: string } | null = null;
   /** Pending commands awaiting approval */
   private pendingCommands: Map<string, PendingCommand>;
+  /** Monotonic time at which each pending command was queued, in request order */
+  private pendingSince: Map<string, number> = new Map();
+  /** IDs of pending commands that already emitted an approval timeout warning */
+  private timedOutCommands: Set<string> = new Set();
+  /** Timer that checks pending commands for approval timeouts */
+  private approvalTimeoutTimer: ReturnType<typeof setInterval> | null = null;
   /** Default timeout for command execution in milliseconds */
   private defaultTimeout: number;
 
@@ -99,12 +110,11 @@ export class CommandService extends EventEmitter {
     super();
     this.shell = options.shell || getDefaultShell();
     this.useShell = options.useShell ?? false;
-    this.whitelist = new Map();
+    this.shellOption = this.useShell ? this.shell : false;
+    // Initialize with platform-specific commands
+    this.whitelist = new Map(getPlatformSpecificCommands().map(entry => [entry.command, entry]));
     this.pendingCommands = new Map();
     this.defaultTimeout = options.defaultTimeout ?? 30000;
-
-    // Initialize with platform-specific commands
-    this.initializeDefaultWhitelist();
   }
 
   /**
@@ -123,25 +133,13 @@ export class CommandService extends EventEmitter {
     return this.useShell;
   }
 
-  /**
-   * Initialize the default command whitelist based on the current platform
-   */
-  private initializeDefaultWhitelist(): void {
-    // Get platform-specific commands
-    const platformCommands = getPlatformSpecificCommands();
-    
-    // Add all commands to the whitelist
-    platformCommands.forEach(entry => {
-      this.whitelist.set(entry.command, entry);
-    });
-  }
-
   /**
    * Add a command to the whitelist
    * @param entry The command whitelist entry
    */
   public addToWhitelist(entry: CommandWhitelistEntry): void {
     this.whitelist.set(entry.command, entry);
+    this.whitelistJson = null;
   }
 
   /**
@@ -149,7 +147,9 @@ export class CommandService extends EventEmitter {
    * @param command The command to remove
    */
   public removeFromWhitelist(command: string): void {
-    this.whitelist.delete(command);
+    if (this.whitelist.delete(command)) {
+      this.whitelistJson = null;
+    }
   }
 
   /**
@@ -160,8 +160,9 @@ export class CommandService extends EventEmitter {
   public updateSecurityLevel(command: string, securityLevel: CommandSecurityLevel): void {
     const entry = this.whitelist.get(command);
     if (entry) {
-      entry.securityLevel = securityLevel;
-      this.whitelist.set(command, entry);
+      // Replace rather than mutate: default entries are shared by every CommandService
+      this.whitelist.set(command, { ...entry, securityLevel });
+      this.whitelistJson = null;
     }
   }
 
@@ -173,6 +174,31 @@ export class CommandService extends EventEmitter {
     return Array.from(this.whitelist.values());
   }
 
+  /**
+   * Get all whitelisted commands serialized as JSON
+   * @param indent Number of spaces to indent with (0 for compact output)
+   * @returns JSON array of command whitelist entries
+   */
+  public getWhitelistJson(indent = 0): string {
+    if (this.whitelistJson === null || this.whitelistJson.indent !== indent) {
+      this.whitelistJson = {
+        indent,
+        json: JSON.stringify(this.getWhitelist(), null, indent)
+      };
+    }
+
+    return this.whitelistJson.json;
+  }
+
+  /**
+   * Get the whitelist entry for a base command
+   * @param baseCommand The command name without any path
+   * @returns The whitelist entry or undefined if the command is not whitelisted
+   */
+  public getWhitelistEntry(baseCommand: string): CommandWhitelistEntry | undefined {
+    return this.whitelist.get(baseCommand);
+  }
+
   /**
    * Get all pending commands awaiting approval
    * @returns Array of pending commands
@@ -181,6 +207,15 @@ export class CommandService extends EventEmitter {
     return Array.from(this.pendingCommands.values());
   }
 
+  /**
+   * Get a pending command by ID
+   * @param commandId ID of the pending command
+   * @returns The pending command or undefined if there is none with that ID
+   */
+  public getPendingCommand(commandId: string): PendingCommand | undefined {
+    return this.pendingCommands.get(commandId);
+  }
+
   /**
    * Validate if a command and its arguments are allowed
    * @param command The command to validate
@@ -188,11 +223,8 @@ export class CommandService extends EventEmitter {
    * @returns The security level of the command or null if not whitelisted
    */
   private validateCommand(command: string, args: string[]): CommandSecurityLevel | null {
-    // Extract the base command (without path) using path.basename
-    const baseCommand = path.basename(command);
-    
     // Check if the command is in the whitelist
-    const entry = this.whitelist.get(baseCommand);
+    const entry = this.whitelist.get(getBaseCommand(command));
     if (!entry) {
       return null;
     }
@@ -267,12 +299,7 @@ export class CommandService extends EventEmitter {
     // For safe commands, execute immediately
     try {
       const timeout = options.timeout || this.defaultTimeout;
-      const { stdout, stderr } = await execFileAsync(command, args, {
-        timeout,
-        shell: this.useShell ? this.shell : false
-      });
-
-      return { stdout, stderr };
+      return await this.runCommand(command, args, timeout);
     } catch (error) {
       if (error instanceof Error) {
         throw new Error(`Command execution failed: ${error.message}`);
@@ -281,6 +308,62 @@ export class CommandService extends EventEmitter {
     }
   }
 
+  /**
+   * Run a command and collect its output
+   * @param command The command to execute
+   * @param args Command arguments
+   * @param timeout Optional timeout in milliseconds
+   * @returns Promise resolving to command output
+   */
+  private runCommand(command: string, args: string[], timeout?: number): Promise<CommandResult> {
+    return new Promise((resolve, reject) => {
+      let timedOut = false;
+      let timeoutTimer: ReturnType<typeof setTimeout> | undefined;
+      let killTimer: ReturnType<typeof setTimeout> | undefined;
+
+      const child = execFile(
+        command,
+        args,
+        {
+          // Keep the raw chunks so each stream is concatenated and decoded exactly once
+          encoding: 'buffer',
+          shell: this.shellOption
+        },
+        (error, stdout, stderr) => {
+          clearTimeout(timeoutTimer);
+          clearTimeout(killTimer);
+
+          if (timedOut) {
+            reject(new Error(`Command timed out after ${timeout}ms`));
+            return;
+          }
+
+          if (error) {
+            reject(error);
+            return;
+          }
+
+          resolve({ stdout: stdout.toString('utf8'), stderr: stderr.toString('utf8') });
+        }
+      );
+
+      if (timeout) {
+        timeoutTimer = setTimeout(() => {
+          timedOut = true;
+          child.kill('SIGTERM');
+
+          // Commands that ignore SIGTERM are killed after a grace period. The pipes are
+          // closed as well, since any children they spawned may still hold them open.
+          killTimer = setTimeout(() => {
+            child.kill('SIGKILL');
+            child.stdout?.destroy();
+            child.stderr?.destroy();
+          }, KILL_GRACE_PERIOD_MS);
+        }, timeout);
+      }
+    });
+  }
+
   /**
    * Queue a command for approval
    * @param command The command to queue
@@ -294,34 +377,7 @@ export class CommandService extends EventEmitter {
     requestedBy?: string
   ): Promise<CommandResult> {
     return new Promise((resolve, reject) => {
-      const id = randomUUID();
-      const pendingCommand: PendingCommand = {
-        id,
-        command,
-        args,
-        requestedAt: new Date(),
-        requestedBy,
-        resolve: (result: CommandResult) => resolve(result),
-        reject: (error: Error) => reject(error)
-      };
-
-      this.pendingCommands.set(id, pendingCommand);
-      
-      // Emit event for pending command
-      this.emit('command:pending', pendingCommand);
-      
-      // Set a timeout to check if the command is still pending after a while
-      // This helps detect if the UI approval didn't properly trigger the approveCommand method
-      setTimeout(() => {
-        // If the command is still pending after the timeout
-        if (this.pendingCommands.has(id)) {
-          // Emit a warning event that can be handled by the client
-          this.emit('command:approval_timeout', {
-            commandId: id,
-            message: 'Command approval timed out. If you approved this command in the UI, please use get_pending_commands and approve_command to complete the process.'
-          });
-        }
-      }, 5000); // 5 second timeout to detect UI approval issues
+      this.enqueueCommand(command, args, requestedBy, resolve, reject);
     });
   }
 
@@ -336,6 +392,31 @@ export class CommandService extends EventEmitter {
     command: string,
     args: string[] = [],
     requestedBy?: string
+  ): string {
+    return this.enqueueCommand(
+      command,
+      args,
+      requestedBy,
+      () => {}, // No-op resolve function
+      () => {}  // No-op reject function
+    );
+  }
+
+  /**
+   * Add a command to the pending queue and schedule the approval timeout check
+   * @param command The command to queue
+   * @param args Command arguments
+   * @param requestedBy Who requested the command
+   * @param resolve Function to call when the command is approved and executed
+   * @param reject Function to call when the command is denied or fails
+   * @returns The ID of the queued command
+   */
+  private enqueueCommand(
+    command: string,
+    args: string[],
+    requestedBy: string | undefined,
+    resolve: PendingCommand['resolve'],
+    reject: PendingCommand['reject']
   ): string {
     const id = randomUUID();
     const pendingCommand: PendingCommand = {
@@ -344,28 +425,74 @@ export class CommandService extends EventEmitter {
       args,
       requestedAt: new Date(),
       requestedBy,
-      resolve: () => {}, // No-op resolve function
-      reject: () => {}   // No-op reject function
+      resolve,
+      reject
     };
 
     this.pendingCommands.set(id, pendingCommand);
+    this.pendingSince.set(id, performance.now());
     
     // Emit event for pending command
     this.emit('command:pending', pendingCommand);
     
-    // Set a timeout to check if the command is still pending after a while
-    setTimeout(() => {
-      // If the command is still pending after the timeout
-      if (this.pendingCommands.has(id)) {
+    // Check later whether the command is still pending
+    // This helps detect if the UI approval didn't properly trigger the approveCommand method
+    this.startApprovalTimeoutTimer();
+    
+    return id;
+  }
+
+  /**
+   * Start the shared approval timeout check unless it is already running
+   */
+  private startApprovalTimeoutTimer(): void {
+    if (this.approvalTimeoutTimer !== null) {
+      return;
+    }
+
+    this.approvalTimeoutTimer = setInterval(this.checkApprovalTimeouts, APPROVAL_TIMEOUT_CHECK_INTERVAL_MS);
+    // Waiting for approvals should not keep the process alive on its own
+    this.approvalTimeoutTimer.unref();
+  }
+
+  /**
+   * Emit an approval timeout warning for each command pending longer than the timeout
+   */
+  private readonly checkApprovalTimeouts = (): void => {
+    // Use the monotonic clock so wall clock adjustments cannot delay or trigger warnings
+    const cutoff = performance.now() - APPROVAL_TIMEOUT_MS;
+
+    for (const [commandId, queuedAt] of this.pendingSince) {
+      // Commands are kept in request order, so every later command is newer
+      if (queuedAt > cutoff) {
+        break;
+      }
+
+      if (!this.timedOutCommands.has(commandId)) {
+        this.timedOutCommands.add(commandId);
         // Emit a warning event that can be handled by the client
         this.emit('command:approval_timeout', {
-          commandId: id,
+          commandId,
           message: 'Command approval timed out. If you approved this command in the UI, please use get_pending_commands and approve_command to complete the process.'
         });
       }
-    }, 5000); // 5 second timeout to detect UI approval issues
-    
-    return id;
+    }
+
+    // Stop checking once every pending command has been warned about
+    if (this.timedOutCommands.size >= this.pendingCommands.size && this.approvalTimeoutTimer !== null) {
+      clearInterval(this.approvalTimeoutTimer);
+      this.approvalTimeoutTimer = null;
+    }
+  };
+
+  /**
+   * Remove a command from the pending queue
+   * @param commandId ID of the command to remove
+   */
+  private removePendingCommand(commandId: string): void {
+    this.pendingCommands.delete(commandId);
+    this.pendingSince.delete(commandId);
+    this.timedOutCommands.delete(commandId);
   }
 
   /**
@@ -380,14 +507,10 @@ export class CommandService extends EventEmitter {
     }
 
     try {
-      const { stdout, stderr } = await execFileAsync(
-        pendingCommand.command,
-        pendingCommand.args,
-        { shell: this.useShell ? this.shell : false }
-      );
+      const { stdout, stderr } = await this.runCommand(pendingCommand.command, pendingCommand.args);
 
       // Remove from pending queue
-      this.pendingCommands.delete(commandId);
+      this.removePendingCommand(commandId);
       
       // Emit event for approved command
       this.emit('command:approved', { commandId, stdout, stderr });
@@ -398,7 +521,7 @@ export class CommandService extends EventEmitter {
       return { stdout, stderr };
     } catch (error) {
       // Remove from pending queue
-      this.pendingCommands.delete(commandId);
+      this.removePendingCommand(commandId);
       
       // Emit event for failed command
       this.emit('command:failed', { commandId, error });
@@ -427,7 +550,7 @@ export class CommandService extends EventEmitter {
     }
 
     // Remove from pending queue
-    this.pendingCommands.delete(commandId);
+    this.removePendingCommand(commandId);
     
     // Emit event for denied command
     this.emit('command:denied', { commandId, reason });
@@ -0,0 +1,25 @@
+/**
+ * Command security level classification
+ */
+export enum CommandSecurityLevel {
+  /** Safe commands that can be executed without approval */
+  SAFE = 'safe',
+  /** Commands that require approval before execution */
+  REQUIRES_APPROVAL = 'requires_approval',
+  /** Commands that are explicitly forbidden */
+  FORBIDDEN = 'forbidden'
+}
+
+/**
+ * Command whitelist entry
+ */
+export interface CommandWhitelistEntry {
+  /** The command path or name */
+  readonly command: string;
+  /** Security level of the command */
+  readonly securityLevel: CommandSecurityLevel;
+  /** Allowed arguments (string for exact match, RegExp for pattern match) */
+  readonly allowedArgs?: ReadonlyArray<string | RegExp>;
+  /** Description of the command for documentation */
+  readonly description?: string;
+}
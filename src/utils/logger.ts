@@ -1,31 +1,44 @@
 import * as fs from 'fs';
 import * as path from 'path';
 
+/** Number of buffered stderr lines that forces an immediate flush */
+const STDERR_BUFFER_CAPACITY = 16;
+
 /**
- * Simple logging utility that writes to a file
+ * Simple logging utility that writes to a file and optionally mirrors to stderr
  */
 export class Logger {
   private logFile: string;
-  private enabled: boolean;
+  private debugEnabled: boolean;
   private fileStream: fs.WriteStream | null = null;
+  private fileCorked = false;
+  private lastTimestampMs = -1;
+  private lastTimestamp = '';
+  private mirrorToStderr: boolean;
+  private stderrBuffer: string[] = [];
+  private stderrFlushScheduled = false;
 
   /**
    * Create a new logger
    * @param logFile Path to the log file
    * @param enabled Whether logging is enabled
+   * @param debugEnabled Whether debug messages are written
+   * @param mirrorToStderr Whether messages are also written to stderr
    */
-  constructor(logFile: string, enabled = true) {
+  constructor(logFile: string, enabled = true, debugEnabled = true, mirrorToStderr = false) {
     this.logFile = logFile;
-    this.enabled = enabled;
+    this.debugEnabled = enabled && debugEnabled;
+    this.mirrorToStderr = mirrorToStderr;
     
-    if (this.enabled) {
+    if (enabled) {
       // Create the directory if it doesn't exist
       const logDir = path.dirname(this.logFile);
-      console.error(`Creating log directory: ${logDir}`);
+      if (this.debugEnabled) {
+        console.error(`Creating log directory: ${logDir}`);
+      }
       try {
-        if (!fs.existsSync(logDir)) {
-          fs.mkdirSync(logDir, { recursive: true });
-        }
+        // recursive also makes this a no-op when the directory already exists
+        fs.mkdirSync(logDir, { recursive: true });
       } catch (error) {
         console.error(`Error creating log directory: ${error}`);
         // Fall back to a directory we know exists
@@ -47,16 +60,102 @@ export class Logger {
    * @param message Message to log
    */
   public log(level: string, message: string): void {
-    if (!this.enabled || !this.fileStream) {
+    // The file stream only exists while logging is enabled
+    if (!this.fileStream) {
       return;
     }
+
+    const logMessage = `[${this.timestamp()}] [${level}] ${message}\n`;
     
-    const timestamp = new Date().toISOString();
-    const logMessage = `[${timestamp}] [${level}] ${message}\n`;
-    
-    this.fileStream.write(logMessage);
+    this.writeToFile(level, logMessage);
+
+    if (this.mirrorToStderr) {
+      this.writeToStderr(level, logMessage);
+    }
+  }
+
+  /**
+   * Get the ISO timestamp for the current time
+   *
+   * Lines logged within the same millisecond reuse the formatted string.
+   * @returns ISO 8601 timestamp
+   */
+  private timestamp(): string {
+    const now = Date.now();
+
+    if (now !== this.lastTimestampMs) {
+      this.lastTimestampMs = now;
+      this.lastTimestamp = new Date(now).toISOString();
+    }
+
+    return this.lastTimestamp;
   }
 
+  /**
+   * Write a line to the log file, batching the lines of one tick into a single write
+   * @param level Log level of the line
+   * @param line Formatted log line
+   */
+  private writeToFile(level: string, line: string): void {
+    const stream = this.fileStream!;
+
+    if (!this.fileCorked) {
+      this.fileCorked = true;
+      stream.cork();
+      process.nextTick(this.uncorkFile);
+    }
+
+    stream.write(line);
+
+    // Errors are written straight away so they are not lost if the process dies
+    if (level === 'ERROR') {
+      this.uncorkFile();
+    }
+  }
+
+  /**
+   * Release the lines buffered in the log file stream
+   */
+  private readonly uncorkFile = (): void => {
+    if (!this.fileCorked) {
+      return;
+    }
+
+    this.fileCorked = false;
+    this.fileStream?.uncork();
+  };
+
+  /**
+   * Buffer a line for stderr so bursts of messages go out in a single write
+   * @param level Log level of the line
+   * @param line Formatted log line
+   */
+  private writeToStderr(level: string, line: string): void {
+    this.stderrBuffer.push(line);
+
+    // Errors are written straight away so they are not lost if the process dies
+    if (level === 'ERROR' || this.stderrBuffer.length >= STDERR_BUFFER_CAPACITY) {
+      this.flushStderr();
+    } else if (!this.stderrFlushScheduled) {
+      this.stderrFlushScheduled = true;
+      setImmediate(this.flushStderr);
+    }
+  }
+
+  /**
+   * Write all buffered stderr lines
+   */
+  private readonly flushStderr = (): void => {
+    this.stderrFlushScheduled = false;
+
+    if (this.stderrBuffer.length === 0) {
+      return;
+    }
+
+    process.stderr.write(this.stderrBuffer.join(''));
+    this.stderrBuffer = [];
+  };
+
   /**
    * Log an info message
    * @param message Message to log
@@ -65,11 +164,25 @@ export class Logger {
     this.log('INFO', message);
   }
 
+  /**
+   * Whether debug messages are written
+   *
+   * Callers should check this before building expensive debug messages.
+   * @returns True if debug logging is enabled
+   */
+  public isDebugEnabled(): boolean {
+    return this.debugEnabled;
+  }
+
   /**
    * Log a debug message
    * @param message Message to log
    */
   public debug(message: string): void {
+    if (!this.debugEnabled) {
+      return;
+    }
+
     this.log('DEBUG', message);
   }
 
@@ -85,6 +198,9 @@ export class Logger {
    * Close the logger
    */
   public close(): void {
+    this.flushStderr();
+    this.uncorkFile();
+
     if (this.fileStream) {
       this.fileStream.end();
       this.fileStream = null;
@@ -99,11 +215,18 @@ let loggerInstance: Logger | null = null;
  * Get the logger instance
  * @param logFile Path to the log file
  * @param enabled Whether logging is enabled
+ * @param debugEnabled Whether debug messages are written
+ * @param mirrorToStderr Whether messages are also written to stderr
  * @returns Logger instance
  */
-export function getLogger(logFile?: string, enabled?: boolean): Logger {
+export function getLogger(
+  logFile?: string,
+  enabled?: boolean,
+  debugEnabled?: boolean,
+  mirrorToStderr?: boolean
+): Logger {
   if (!loggerInstance && logFile) {
-    loggerInstance = new Logger(logFile, enabled);
+    loggerInstance = new Logger(logFile, enabled, debugEnabled, mirrorToStderr);
   }
   
   if (!loggerInstance) {
@@ -0,0 +1,18 @@
+/**
+ * Wrap a function without parameters so its result is computed only once
+ * @param fn Function computing the value
+ * @returns Function returning the value computed on the first call
+ */
+export function memoize<T>(fn: () => T): () => T {
+  let computed = false;
+  let value: T | undefined;
+
+  return () => {
+    if (!computed) {
+      value = fn();
+      computed = true;
+    }
+
+    return value as T;
+  };
+}
@@ -1,6 +1,7 @@
 import * as os from 'os';
 import * as path from 'path';
 import * as fs from 'fs';
+import { memoize } from './memoize-utils.js';
 
 /**
  * Supported platform types
@@ -12,25 +13,32 @@ export enum PlatformType {
   UNKNOWN = 'unknown'
 }
 
+/**
+ * Platform types for the supported process.platform values
+ */
+const NODE_PLATFORMS: Partial<Record<typeof process.platform, PlatformType>> = {
+  win32: PlatformType.WINDOWS,
+  darwin: PlatformType.MACOS,
+  linux: PlatformType.LINUX
+};
+
 /**
  * Detect the current platform
+ *
+ * The result is cached, since process.platform cannot change at runtime.
  * @returns The detected platform type
  */
-export function detectPlatform(): PlatformType {
-  const platform = process.platform;
-  
-  if (platform === 'win32') return PlatformType.WINDOWS;
-  if (platform === 'darwin') return PlatformType.MACOS;
-  if (platform === 'linux') return PlatformType.LINUX;
-  
-  return PlatformType.UNKNOWN;
-}
+export const detectPlatform = memoize((): PlatformType =>
+  NODE_PLATFORMS[process.platform] ?? PlatformType.UNKNOWN
+);
 
 /**
  * Get the default shell for the current platform
+ *
+ * The result is cached after the first call.
  * @returns Path to the default shell
  */
-export function getDefaultShell(): string {
+export const getDefaultShell = memoize((): string => {
   const platform = detectPlatform();
   
   switch (platform) {
@@ -43,39 +51,71 @@ export function getDefaultShell(): string {
     default:
       return process.env.SHELL || '/bin/sh';
   }
-}
+});
+
+/** Maximum number of shell paths whose validation result is cached */
+const SHELL_PATH_CACHE_SIZE = 64;
+
+/** Cached validation results, least recently used first */
+const shellPathCache = new Map<string, boolean>();
 
 /**
  * Validate if a shell path exists and is executable
+ *
+ * Results are cached for the most recently used paths, so later changes to a
+ * cached path (installing, removing or chmodding the shell) are not picked up.
  * @param shellPath Path to the shell
  * @returns True if the shell is valid
  */
 export function validateShellPath(shellPath: string): boolean {
-  try {
-    return fs.existsSync(shellPath) && fs.statSync(shellPath).isFile();
-  } catch (error) {
-    return false;
+  let valid = shellPathCache.get(shellPath);
+
+  if (valid !== undefined) {
+    // Re-insert so the path becomes the most recently used
+    shellPathCache.delete(shellPath);
+  } else {
+    try {
+      // Only regular files need the separate executable check
+      valid = fs.statSync(shellPath, { throwIfNoEntry: false })?.isFile() ?? false;
+      if (valid) {
+        fs.accessSync(shellPath, fs.constants.X_OK);
+      }
+    } catch (error) {
+      valid = false;
+    }
+
+    if (shellPathCache.size >= SHELL_PATH_CACHE_SIZE) {
+      shellPathCache.delete(shellPathCache.keys().next().value!);
+    }
   }
+
+  shellPathCache.set(shellPath, valid);
+  return valid;
 }
 
+/**
+ * Suggested shells for each platform
+ */
+const SHELL_SUGGESTIONS: Readonly<Record<PlatformType, readonly string[]>> = {
+  [PlatformType.WINDOWS]: ['cmd.exe', 'powershell.exe', 'pwsh.exe'],
+  [PlatformType.MACOS]: ['/bin/zsh', '/bin/bash', '/bin/sh'],
+  [PlatformType.LINUX]: ['/bin/bash', '/bin/sh', '/bin/zsh'],
+  [PlatformType.UNKNOWN]: ['/bin/sh']
+};
+
 /**
  * Get shell suggestions for each platform
  * @returns Record of platform types to array of suggested shells
  */
-export function getShellSuggestions(): Record<PlatformType, string[]> {
-  return {
-    [PlatformType.WINDOWS]: ['cmd.exe', 'powershell.exe', 'pwsh.exe'],
-    [PlatformType.MACOS]: ['/bin/zsh', '/bin/bash', '/bin/sh'],
-    [PlatformType.LINUX]: ['/bin/bash', '/bin/sh', '/bin/zsh'],
-    [PlatformType.UNKNOWN]: ['/bin/sh']
-  };
+export function getShellSuggestions(): Readonly<Record<PlatformType, readonly string[]>> {
+  return SHELL_SUGGESTIONS;
 }
 
 /**
  * Get common locations for shells on the current platform
- * @returns Array of common shell locations
+ * @returns Cached array of common shell locations
  */
-export function getCommonShellLocations(): string[] {
+export const getCommonShellLocations = memoize((): readonly string[] => {
   const platform = detectPlatform();
   
   switch (platform) {
@@ -92,31 +132,30 @@ export function getCommonShellLocations(): string[] {
     default:
       return ['/bin/sh'];
   }
-}
+});
 
 /**
  * Get helpful message for shell configuration
+ *
+ * The message is built once and cached.
  * @returns A helpful message with shell configuration guidance
  */
-export function getShellConfigurationHelp(): string {
+export const getShellConfigurationHelp = memoize((): string => {
   const platform = detectPlatform();
   const suggestions = getShellSuggestions()[platform];
   const locations = getCommonShellLocations();
-  
-  let message = 'Shell Configuration Help:\n\n';
-  
-  message += `Detected platform: ${platform}\n\n`;
-  message += 'Suggested shells for this platform:\n';
-  suggestions.forEach(shell => {
-    message += `- ${shell}\n`;
-  });
-  
-  message += '\nCommon shell locations on this platform:\n';
-  locations.forEach(location => {
-    message += `- ${location}\n`;
-  });
-  
-  message += '\nTo configure a custom shell, provide the full path to the shell executable.';
-  
-  return message;
-}
+
+  return [
+    'Shell Configuration Help:',
+    '',
+    `Detected platform: ${platform}`,
+    '',
+    'Suggested shells for this platform:',
+    ...suggestions.map(shell => `- ${shell}`),
+    '',
+    'Common shell locations on this platform:',
+    ...locations.map(location => `- ${location}`),
+    '',
+    'To configure a custom shell, provide the full path to the shell executable.'
+  ].join('\n');
+});
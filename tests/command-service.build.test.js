@@ -0,0 +1,134 @@
+const os = require('os');
+const { BUILD_URL, runBuilt } = require('./run-built.cjs');
+
+// These tests exercise the compiled CommandService rather than the jest.setup.cjs mock
+const describePosix = process.platform === 'win32' ? describe.skip : describe;
+
+describePosix('CommandService (compiled)', () => {
+  test('should run shell built-ins through the shell', async () => {
+    const result = await runBuilt(`
+      const { CommandService } = await import('${BUILD_URL}/services/command-service.js');
+      const commandService = new CommandService({ useShell: true });
+      const cd = await commandService.executeCommand('cd', [${JSON.stringify(os.tmpdir())}]);
+      console.log(JSON.stringify(cd));
+    `);
+
+    expect(result).toEqual({ stdout: '', stderr: '' });
+  });
+
+  test('should keep shell word splitting for empty arguments', async () => {
+    const result = await runBuilt(`
+      const { CommandService } = await import('${BUILD_URL}/services/command-service.js');
+      const commandService = new CommandService({ useShell: true });
+      const echo = await commandService.executeCommand('echo', ['a', '', 'b']);
+      console.log(JSON.stringify(echo));
+    `);
+
+    expect(result.stdout).toBe('a b\n');
+  });
+
+  test('should refresh the cached whitelist JSON after the whitelist changes', async () => {
+    const result = await runBuilt(`
+      const { CommandService, CommandSecurityLevel } = await import('${BUILD_URL}/services/command-service.js');
+      const commandService = new CommandService();
+      const levelOf = (command) => {
+        const entry = JSON.parse(commandService.getWhitelistJson()).find(e => e.command === command);
+        return entry ? entry.securityLevel : null;
+      };
+
+      const before = levelOf('custom-tool');
+      commandService.addToWhitelist({ command: 'custom-tool', securityLevel: CommandSecurityLevel.SAFE });
+      const added = levelOf('custom-tool');
+      commandService.updateSecurityLevel('custom-tool', CommandSecurityLevel.FORBIDDEN);
+      const updated = levelOf('custom-tool');
+      commandService.removeFromWhitelist('custom-tool');
+      const removed = levelOf('custom-tool');
+
+      const compact = commandService.getWhitelistJson();
+      const indented = commandService.getWhitelistJson(2);
+
+      console.log(JSON.stringify({
+        before,
+        added,
+        updated,
+        removed,
+        indented: indented === JSON.stringify(JSON.parse(compact), null, 2),
+        compactAgain: commandService.getWhitelistJson() === compact && compact !== indented
+      }));
+    `);
+
+    expect(result).toEqual({
+      before: null,
+      added: 'safe',
+      updated: 'forbidden',
+      removed: null,
+      indented: true,
+      compactAgain: true
+    });
+  });
+
+  test('should kill a timed out command that ignores SIGTERM', async () => {
+    const result = await runBuilt(`
+      const { CommandService, CommandSecurityLevel } = await import('${BUILD_URL}/services/command-service.js');
+      const commandService = new CommandService();
+      commandService.addToWhitelist({ command: 'sh', securityLevel: CommandSecurityLevel.SAFE });
+
+      const start = Date.now();
+      try {
+        await commandService.executeCommand('sh', ['-c', 'trap "" TERM; sleep 10 & wait'], { timeout: 200 });
+        console.log(JSON.stringify({ message: null }));
+      } catch (error) {
+        console.log(JSON.stringify({ message: error.message, elapsed: Date.now() - start }));
+      }
+    `);
+
+    expect(result.message).toContain('Command timed out after 200ms');
+    // The timeout plus the one second grace period before SIGKILL, with some slack
+    expect(result.elapsed).toBeLessThan(3000);
+  });
+
+  test('should warn once per command that stays pending past the approval timeout', async () => {
+    const result = await runBuilt(`
+      const { CommandService } = await import('${BUILD_URL}/services/command-service.js');
+      const commandService = new CommandService();
+      const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+      const warnings = {};
+      commandService.on('command:approval_timeout', ({ commandId }) => {
+        warnings[commandId] = (warnings[commandId] || 0) + 1;
+      });
+
+      const first = commandService.queueCommandForApprovalNonBlocking('echo', ['first']);
+      await sleep(2000);
+      const second = commandService.queueCommandForApprovalNonBlocking('echo', ['second']);
+      const approved = commandService.queueCommandForApprovalNonBlocking('echo', ['approved']);
+      await commandService.approveCommand(approved);
+
+      // Both remaining commands have timed out, so the check stops itself. The waits
+      // leave a full check interval of slack past the five second approval timeout.
+      await sleep(7000);
+      const stoppedAfterWarnings = commandService.approvalTimeoutTimer === null;
+
+      const third = commandService.queueCommandForApprovalNonBlocking('echo', ['third']);
+      const restarted = commandService.approvalTimeoutTimer !== null;
+      await sleep(7000);
+
+      console.log(JSON.stringify({
+        first: warnings[first],
+        second: warnings[second],
+        third: warnings[third],
+        approved: warnings[approved] ?? 0,
+        stoppedAfterWarnings,
+        restarted
+      }));
+    `);
+
+    expect(result).toEqual({
+      first: 1,
+      second: 1,
+      third: 1,
+      approved: 0,
+      stoppedAfterWarnings: true,
+      restarted: true
+    });
+  }, 25000);
+});
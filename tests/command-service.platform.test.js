@@ -1,3 +1,4 @@
+const { once } = require('events');
 const { CommandService, CommandSecurityLevel } = require('../build/services/command-service.js');
 const { detectPlatform, PlatformType } = require('../build/utils/platform-utils.js');
 
@@ -67,6 +68,7 @@ describe('CommandService Platform Tests', () => {
     commandService.on('command:pending', (pendingCommand) => {
       pendingCommandId = pendingCommand.id;
     });
+    const pendingEvent = once(commandService, 'command:pending');
     
     // Choose a command requiring approval based on platform
     // Use a command that doesn't actually create anything to avoid test failures
@@ -76,8 +78,8 @@ describe('CommandService Platform Tests', () => {
     // Execute a command that requires approval
     const executePromise = commandService.executeCommand(command, args);
     
-    // Wait a bit for the event to fire
-    await new Promise(resolve => setTimeout(resolve, 100));
+    // Wait for the event to fire
+    await pendingEvent;
     
     // Check if we got a pending command
     expect(pendingCommandId).not.toBeNull();
@@ -108,6 +110,7 @@ describe('CommandService Platform Tests', () => {
     commandService.on('command:pending', (pendingCommand) => {
       pendingCommandId = pendingCommand.id;
     });
+    const pendingEvent = once(commandService, 'command:pending');
     
     // Choose a command requiring approval based on platform
     const command = currentPlatform === PlatformType.WINDOWS ? 'mkdir' : 'mkdir';
@@ -116,8 +119,8 @@ describe('CommandService Platform Tests', () => {
     // Execute a command that requires approval
     const executePromise = commandService.executeCommand(command, args);
     
-    // Wait a bit for the event to fire
-    await new Promise(resolve => setTimeout(resolve, 100));
+    // Wait for the event to fire
+    await pendingEvent;
     
     // Check if we got a pending command
     expect(pendingCommandId).not.toBeNull();
@@ -1,3 +1,4 @@
+const { once } = require('events');
 const { CommandService, CommandSecurityLevel } = require('../build/services/command-service.js');
 const { getDefaultShell } = require('../build/utils/platform-utils.js');
 
@@ -115,13 +116,14 @@ describe('CommandService', () => {
     commandService.on('command:pending', (pendingCommand) => {
       pendingCommandId = pendingCommand.id;
     });
+    const pendingEvent = once(commandService, 'command:pending');
     
     // Execute a command that requires approval
     // Use a command that doesn't actually create anything to avoid test failures
     const executePromise = commandService.executeCommand('cp', ['nonexistent-file', 'nonexistent-copy']);
     
-    // Wait a bit for the event to fire
-    await new Promise(resolve => setTimeout(resolve, 100));
+    // Wait for the event to fire
+    await pendingEvent;
     
     // Check if we got a pending command
     expect(pendingCommandId).not.toBeNull();
@@ -159,12 +161,13 @@ describe('CommandService', () => {
     commandService.on('command:pending', (pendingCommand) => {
       pendingCommandId = pendingCommand.id;
     });
+    const pendingEvent = once(commandService, 'command:pending');
     
     // Execute a command that requires approval (mkdir)
     const executePromise = commandService.executeCommand('mkdir', ['test-dir']);
     
-    // Wait a bit for the event to fire
-    await new Promise(resolve => setTimeout(resolve, 100));
+    // Wait for the event to fire
+    await pendingEvent;
     
     // Check if we got a pending command
     expect(pendingCommandId).not.toBeNull();
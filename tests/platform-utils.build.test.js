@@ -0,0 +1,81 @@
+const { BUILD_URL, runBuilt } = require('./run-built.cjs');
+
+// These tests exercise the compiled platform utilities rather than the jest.setup.cjs mock
+const describePosix = process.platform === 'win32' ? describe.skip : describe;
+
+describePosix('validateShellPath (compiled)', () => {
+  test('should only accept executable regular files', async () => {
+    const result = await runBuilt(`
+      import * as fs from 'fs';
+      import * as os from 'os';
+      import * as path from 'path';
+      const { validateShellPath } = await import('${BUILD_URL}/utils/platform-utils.js');
+
+      const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'super-shell-mcp-'));
+      const script = path.join(dir, 'script.sh');
+      fs.writeFileSync(script, '', { mode: 0o644 });
+
+      console.log(JSON.stringify({
+        executable: validateShellPath(process.execPath),
+        notExecutable: validateShellPath(script),
+        directory: validateShellPath(dir),
+        missing: validateShellPath(path.join(dir, 'missing'))
+      }));
+      fs.rmSync(dir, { recursive: true });
+    `);
+
+    expect(result).toEqual({
+      executable: true,
+      notExecutable: false,
+      directory: false,
+      missing: false
+    });
+  });
+
+  test('should evict the least recently used path first', async () => {
+    const result = await runBuilt(`
+      import fs from 'fs';
+      import * as os from 'os';
+      import * as path from 'path';
+      import { syncBuiltinESMExports } from 'module';
+      const { validateShellPath } = await import('${BUILD_URL}/utils/platform-utils.js');
+
+      // Count the statSync calls made by validateShellPath to tell cache hits from misses
+      let stats = 0;
+      const statSync = fs.statSync;
+      fs.statSync = (...args) => {
+        stats++;
+        return statSync(...args);
+      };
+      syncBuiltinESMExports();
+      const statsFor = (paths) => {
+        const before = stats;
+        paths.forEach(p => validateShellPath(p));
+        return stats - before;
+      };
+
+      const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'super-shell-mcp-'));
+      const missing = (i) => path.join(dir, 'missing-' + i);
+
+      // Fill the cache, using the first path again before one more path forces an eviction
+      const filled = statsFor([process.execPath, ...Array.from({ length: 63 }, (_, i) => missing(i))]);
+      const reused = statsFor([process.execPath]);
+      statsFor([missing(63)]);
+
+      console.log(JSON.stringify({
+        filled,
+        reused,
+        recentlyUsed: statsFor([process.execPath, missing(1)]),
+        leastRecentlyUsed: statsFor([missing(0)])
+      }));
+      fs.rmSync(dir, { recursive: true });
+    `);
+
+    expect(result).toEqual({
+      filled: 64,
+      reused: 0,
+      recentlyUsed: 0,
+      leastRecentlyUsed: 1
+    });
+  });
+});
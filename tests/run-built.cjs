@@ -0,0 +1,28 @@
+const { execFile } = require('child_process');
+const path = require('path');
+const { pathToFileURL } = require('url');
+
+// URL of the compiled sources. Tests that require '../build/...' get the mocks
+// from jest.setup.cjs instead, so the real modules are loaded in a separate process.
+const BUILD_URL = pathToFileURL(path.join(__dirname, '../build')).href;
+
+/**
+ * Run an ES module script in a separate Node process and parse the JSON it prints
+ * @param {string} script Module source; use BUILD_URL to import the compiled sources
+ * @returns {Promise<any>} The parsed standard output of the script
+ */
+const runBuilt = (script) => new Promise((resolve, reject) => {
+  execFile(process.execPath, ['--input-type=module', '-e', script], (error, stdout, stderr) => {
+    if (error) {
+      reject(new Error(stderr || error.message));
+      return;
+    }
+
+    resolve(JSON.parse(stdout));
+  });
+});
+
+module.exports = {
+  BUILD_URL,
+  runBuilt
+};